@@ -10,4 +10,8 @@ __all__ = [
     ,"notion_client"
     ,"parser"
     ,"exporter"
+    ,"log_pipeline"
+    ,"attachments"
+    ,"export_index"
+    ,"pull"
 ]
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from .export_index import atomic_write_text
+from .notion_client import NotionClient
+
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "upload_cache.json"
+
+EMBED_RE = re.compile(r"!\[\[([^\]|#]+)(?:[|#][^\]]*)?\]\]")
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".bmp", ".tif", ".tiff", ".heic", ".ico"}
+FILE_EXTENSIONS = {
+    ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".csv", ".txt", ".zip"
+    ,".mp3", ".m4a", ".wav", ".ogg", ".flac", ".mp4", ".mov", ".webm", ".mkv"
+}
+ATTACHMENT_EXTENSIONS = IMAGE_EXTENSIONS | FILE_EXTENSIONS
+MAX_SINGLE_PART_BYTES = 20 * 1024 * 1024
+UPLOAD_WORKERS = 4
+
+
+def is_attachment(target: str) -> bool:
+    """Return True for embeds that point at known attachment types rather than other notes."""
+
+    return Path(target).suffix.lower() in ATTACHMENT_EXTENSIONS
+
+
+def find_attachment_embeds(pieces: Iterable[str]) -> List[str]:
+    """Return ordered unique ![[attachment]] targets found in the streamed body text."""
+
+    seen = set()
+    ordered: List[str] = []
+    for piece in pieces:
+        for match in EMBED_RE.finditer(piece):
+            value = match.group(1).strip()
+            if value and is_attachment(value) and value not in seen:
+                seen.add(value)
+                ordered.append(value)
+    return ordered
+
+
+def attachment_block(target: str, upload_id: str) -> Dict:
+    """Build an image, pdf, or file block that references an uploaded file."""
+
+    suffix = Path(target).suffix.lower()
+    if suffix in IMAGE_EXTENSIONS:
+        block_type = "image"
+    elif suffix == ".pdf":
+        block_type = "pdf"
+    else:
+        block_type = "file"
+    return {
+        "object": "block"
+        ,"type": block_type
+        ,block_type: {"type": "file_upload", "file_upload": {"id": upload_id}}
+    }
+
+
+def file_digest(path: Path) -> str:
+    """Return the sha256 hex digest of a file, reading it in blocks."""
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AttachmentResolver:
+    """Locate embedded files the way Obsidian does: by name, next to the note or anywhere in the attachments folder."""
+
+    def __init__(self, attachments_path: Optional[Path]) -> None:
+        self.attachments_path = attachments_path
+        self._index: Optional[Dict[str, Path]] = None
+
+    def _build_index(self) -> Dict[str, Path]:
+        index: Dict[str, Path] = {}
+        if self.attachments_path and self.attachments_path.is_dir():
+            for root, _, files in os.walk(self.attachments_path):
+                for name in files:
+                    index.setdefault(name, Path(root) / name)
+        return index
+
+    def resolve(self, target: str, note_path: Path) -> Optional[Path]:
+        candidates = [note_path.parent / target]
+        if self.attachments_path:
+            candidates.append(self.attachments_path / target)
+        for candidate in candidates:
+            if candidate.is_file():
+                return candidate
+
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index.get(Path(target).name)
+
+
+def workspace_key(token: str) -> str:
+    """Derive a cache scope from the integration token without storing the token itself."""
+
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+class UploadCache:
+    """Local JSON map of content hash -> Notion file upload id, so identical files upload once.
+
+    Entries are scoped per integration token, since upload ids are only valid
+    in the workspace that created them.
+    """
+
+    def __init__(self, token: str, path: Path = CACHE_PATH) -> None:
+        self.path = path
+        self.scope = workspace_key(token)
+        self._lock = threading.Lock()
+        self._scopes: Dict[str, Dict[str, Dict[str, str]]] = {}
+        if path.exists():
+            try:
+                self._scopes = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._scopes = {}
+        self._entries = self._scopes.setdefault(self.scope, {})
+
+    def get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(digest)
+        return entry["file_upload_id"] if entry else None
+
+    def put(self, digest: str, upload_id: str, filename: str) -> None:
+        with self._lock:
+            self._entries[digest] = {"file_upload_id": upload_id, "filename": filename}
+
+    def discard(self, digest: str) -> None:
+        with self._lock:
+            self._entries.pop(digest, None)
+
+    def save(self) -> None:
+        with self._lock:
+            atomic_write_text(self.path, json.dumps(self._scopes, indent=2))
+
+
+class AttachmentUploader:
+    """Upload files concurrently, reusing cached upload ids by content hash.
+
+    Fresh uploads are only written to the cache by ``commit``, which callers
+    run once the blocks referencing them were created; until then an upload
+    may still expire unattached. Each worker thread gets its own client, since
+    a ``requests.Session`` is not guaranteed to be thread-safe.
+    """
+
+    def __init__(self, token: str, cache: UploadCache, *, max_workers: int = UPLOAD_WORKERS) -> None:
+        self.token = token
+        self.cache = cache
+        self.max_workers = max_workers
+        self._local = threading.local()
+        self._paths: Dict[str, Path] = {}
+        self._ids: Dict[str, str] = {}
+        self._fresh: Set[str] = set()
+
+    def _client(self) -> NotionClient:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = NotionClient(self.token)
+        return client
+
+    def _upload(self, digest: str) -> str:
+        return self._client().upload_file(self._paths[digest])
+
+    def _upload_all(self, digests: Sequence[str]) -> None:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for digest, upload_id in zip(digests, pool.map(self._upload, digests)):
+                self._ids[digest] = upload_id
+                self._fresh.add(digest)
+
+    def upload(self, paths: Sequence[Path]) -> Dict[Path, str]:
+        """Return path -> file upload id, uploading each distinct uncached file once.
+
+        Files over Notion's single-part limit are skipped.
+        """
+
+        def digest_for(path: Path) -> Optional[str]:
+            if path.stat().st_size > MAX_SINGLE_PART_BYTES:
+                print(f"[warn] Skipping attachment over 20 MB: {path}")
+                return None
+            return file_digest(path)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            digests = dict(zip(paths, pool.map(digest_for, paths)))
+
+        pending: List[str] = []
+        for path, digest in digests.items():
+            if not digest or digest in self._paths:
+                continue
+            self._paths[digest] = path
+            cached = self.cache.get(digest)
+            if cached:
+                self._ids[digest] = cached
+            else:
+                pending.append(digest)
+        self._upload_all(pending)
+
+        return {path: self._ids[digest] for path, digest in digests.items() if digest in self._ids}
+
+    def cached_ids(self) -> Set[str]:
+        """Upload ids used this run that came from the cache rather than a fresh upload."""
+
+        return {upload_id for digest, upload_id in self._ids.items() if digest not in self._fresh}
+
+    def replace_cached(self, upload_ids: Set[str]) -> Dict[str, str]:
+        """Drop the given cached ids, upload those files again, and return old -> new ids.
+
+        Called when Notion rejects a request over file uploads it referenced,
+        e.g. because a cached id expired before it was ever attached.
+        """
+
+        stale = [
+            digest for digest, upload_id in self._ids.items()
+            if digest not in self._fresh and upload_id in upload_ids
+        ]
+        if not stale:
+            return {}
+        old_ids = {digest: self._ids[digest] for digest in stale}
+        for digest in stale:
+            self.cache.discard(digest)
+        self.cache.save()
+
+        self._upload_all(stale)
+        return {old_ids[digest]: self._ids[digest] for digest in stale}
+
+    def commit(self) -> None:
+        """Cache the uploads made this run, once the blocks using them exist in Notion."""
+
+        if not self._fresh:
+            return
+        for digest in self._fresh:
+            self.cache.put(digest, self._ids[digest], self._paths[digest].name)
+        self.cache.save()
@@ -4,12 +4,19 @@ import argparse
 import json
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
 from .config import ConfigurationError, DatabaseRoute, EnvConfig, load_env_file
-from .exporter import export_note
+from .export_index import ExportIndex
+from .exporter import PartialExportError, export_note
+from .log_pipeline import configure_debug_logger, configure_logging
 from .notion_client import NotionClient
-from .parser import parse_note
+from .parser import ObsidianNote, parse_note
+from .pull import pull_updates
+
+
+# Notes larger than this are parsed header-only and their body streamed from disk.
+STREAM_BODY_THRESHOLD_BYTES = 1024 * 1024
 
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -24,7 +31,12 @@ def build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Write full payloads and Notion responses to export.debug.log",
     )
-    parser.add_argument("note_path", help="Markdown file to export.")
+    parser.add_argument(
+        "--pull",
+        action="store_true",
+        help="Pull properties edited in Notion back into the front matter of exported notes.",
+    )
+    parser.add_argument("note_path", nargs="?", help="Markdown file to export.")
     return parser
 
 
@@ -65,26 +77,41 @@ def run_cli(argv: Optional[list[str]] = None) -> None:
 
     parser = build_arg_parser()
     args = parser.parse_args(argv)
+    if not args.pull and not args.note_path:
+        parser.error("note_path is required unless --pull is given")
 
     logger = configure_logging()
     debug_logger = configure_debug_logger() if args.debug_log else None
 
     env_config = load_env_file(Path(args.env))
+    if args.pull:
+        run_pull(env_config, logger, debug_logger)
+        return
+
     client = NotionClient(env_config.token) if (args.send or not args.skip_lookups) else None
 
     note_path = Path(args.note_path)
     logger.info("Starting export for %s", note_path)
-    note = parse_note(note_path)
+    note = parse_note(note_path, load_body=note_path.stat().st_size <= STREAM_BODY_THRESHOLD_BYTES)
     database = route_for_note(note_path, env_config)
-    result = export_note(
-        note
-        ,env_config
-        ,database
-        ,client=client
-        ,skip_lookups=args.skip_lookups
-        ,send_to_notion=args.send
-        ,debug_logger=debug_logger
-    )
+    index = ExportIndex.load()
+    try:
+        result = export_note(
+            note
+            ,env_config
+            ,database
+            ,client=client
+            ,skip_lookups=args.skip_lookups
+            ,send_to_notion=args.send
+            ,debug_logger=debug_logger
+            ,link_index=index.link_targets()
+        )
+    except PartialExportError as err:
+        # Record the page anyway so a re-run can find it instead of creating a duplicate.
+        print(f"[error] {err}. Page: {err.notion_url}")
+        logger.error("Partial export for %s: page %s (%s) is missing body blocks", note.path, err.page_id, err.notion_url)
+        record_export(index, err.page_id, err.relation_names, note, database)
+        raise
 
     print(f"[info] Processed {note.path}")
     logger.info("Processed %s", note.path)
@@ -109,39 +136,62 @@ def run_cli(argv: Optional[list[str]] = None) -> None:
     if result.missing_projects:
         for proj in result.missing_projects:
             print(f"⚠ Missing project for Notion lookup: {proj}")
+    if result.missing_attachments:
+        missing_attachments = ", ".join(result.missing_attachments)
+        logger.warning("Missing attachments for %s: %s", note.path, missing_attachments)
+        for attachment in result.missing_attachments:
+            print(f"⚠ Missing attachment file: {attachment}")
+
+    if result.appended_blocks:
+        verb = "Appended" if args.send else "Would append"
+        print(f"[info] {verb} {result.appended_blocks} additional blocks after page creation")
+        logger.info("%s %d additional blocks for %s", verb, result.appended_blocks, note.path)
 
     if not args.send:
         print(json.dumps(result.payload, indent=2))
         logger.info("Dry-run complete for %s", note.path)
         if debug_logger:
-            debug_logger.info("Payload for %s:\n%s", note.path, json.dumps(result.payload, indent=2))
+            debug_logger.info("Payload for %s", note.path, extra={"data": result.payload})
     else:
         print(f"[info] Created Notion page: {result.notion_url}")
         logger.info("Created Notion page for %s at %s", note.path, result.notion_url)
-LOG_PATH = Path(__file__).resolve().parent.parent / "export.log"
-DEBUG_LOG_PATH = Path(__file__).resolve().parent.parent / "export.debug.log"
-LOGGER_NAME = "obsidian_to_notion"
-
-
-def configure_logging() -> logging.Logger:
-    """Set up the primary info-level logger that writes to export.log."""
-
-    logger = logging.getLogger(LOGGER_NAME)
-    if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        handler = logging.FileHandler(LOG_PATH, encoding="utf-8")
-        handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
-        logger.addHandler(handler)
-    return logger
-
-
-def configure_debug_logger() -> logging.Logger:
-    """Create or return the debug logger that captures payloads/API responses."""
-    
-    debug_logger = logging.getLogger(f"{LOGGER_NAME}.debug")
-    if not debug_logger.handlers:
-        debug_logger.setLevel(logging.INFO)
-        handler = logging.FileHandler(DEBUG_LOG_PATH, encoding="utf-8")
-        handler.setFormatter(logging.Formatter("%(asctime)s [DEBUG] %(message)s"))
-        debug_logger.addHandler(handler)
-    return debug_logger
+
+    record_export(index, result.page_id, result.relation_names, note, database)
+
+
+def record_export(
+    index: ExportIndex
+    ,page_id: Optional[str]
+    ,relation_names: Dict[str, str]
+    ,note: ObsidianNote
+    ,database: DatabaseRoute
+) -> None:
+    """Persist the created page and resolved relation pages to the export index."""
+
+    if not page_id and not relation_names:
+        return
+    if page_id:
+        index.record_page(page_id, note.path, note.source_name, database.resolved_db_id)
+    index.record_relations(relation_names)
+    index.save()
+
+
+def run_pull(env_config: EnvConfig, logger: logging.Logger, debug_logger: Optional[logging.Logger]) -> None:
+    """Sync Notion-side property edits back into the exported notes."""
+
+    database_ids = list(dict.fromkeys(
+        db_id for db_id in (env_config.default_meetings_db_id, env_config.default_notes_db_id) if db_id
+    ))
+    index = ExportIndex.load()
+    logger.info("Starting pull for %d databases", len(database_ids))
+    result = pull_updates(NotionClient(env_config.token), index, database_ids, debug_logger=debug_logger)
+    index.save()
+
+    for note_path, keys in result.updated.items():
+        print(f"[info] Updated {note_path}: {', '.join(keys)}")
+        logger.info("Pulled %s into %s", ", ".join(keys), note_path)
+    for note_path in result.missing_notes:
+        print(f"[warn] Exported note no longer exists: {note_path}")
+        logger.warning("Exported note no longer exists: %s", note_path)
+    print(f"[info] Pull complete: {result.pages_seen} changed pages, {len(result.updated)} notes updated")
+    logger.info("Pull complete: %d changed pages, %d notes updated", result.pages_seen, len(result.updated))
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+
+INDEX_PATH = Path(__file__).resolve().parent.parent / "export_index.json"
+
+
+def atomic_write_text(path: Path, text: str, *, newline: Optional[str] = None) -> None:
+    """Write ``text`` to a sibling temp file and swap it into place."""
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8", newline=newline) as handle:
+        handle.write(text)
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class ExportIndex:
+    '''Local record of exported pages, known relation pages, and pull watermarks'''
+
+    path: Path = INDEX_PATH
+    pages: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    relations: Dict[str, str] = field(default_factory=dict)
+    watermarks: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> "ExportIndex":
+        """Read the index from disk, starting empty if it is missing or unreadable."""
+
+        if not path.exists():
+            return cls(path=path)
+        try:
+            raw = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path=path)
+        return cls(
+            path=path
+            ,pages=raw.get("pages", {})
+            ,relations=raw.get("relations", {})
+            ,watermarks=raw.get("watermarks", {})
+        )
+
+    def record_page(self, page_id: str, note_path: Path, title: str, database_id: str) -> None:
+        self.pages[page_id] = {
+            "path": str(note_path.resolve())
+            ,"title": title
+            ,"database_id": database_id
+        }
+
+    def record_relations(self, names_by_id: Dict[str, str]) -> None:
+        self.relations.update(names_by_id)
+
+    def link_targets(self) -> Dict[str, str]:
+        """Map case-folded note and relation names to page ids for resolving [[links]] locally."""
+
+        targets = {name.casefold(): page_id for page_id, name in self.relations.items()}
+        targets.update((entry["title"].casefold(), page_id) for page_id, entry in self.pages.items())
+        return targets
+
+    def save(self) -> None:
+        payload = {"pages": self.pages, "relations": self.relations, "watermarks": self.watermarks}
+        atomic_write_text(self.path, json.dumps(payload, indent=2, ensure_ascii=False))
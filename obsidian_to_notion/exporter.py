@@ -1,17 +1,42 @@
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import re
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import groupby
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
+import requests
+
+from .attachments import (
+    AttachmentResolver
+    ,AttachmentUploader
+    ,UploadCache
+    ,attachment_block
+    ,find_attachment_embeds
+)
 from .config import DatabaseRoute, EnvConfig
 from .notion_client import NotionClient
-from .parser import ObsidianNote, parse_front_matter_and_remainder
+from .parser import (
+    BRACKETS_RE
+    ,ObsidianNote
+    ,iter_body_text
+    ,link_path
+    ,link_target
+    ,parse_front_matter_and_remainder
+)
+
+
+CHUNK_SIZE = 1900
+MAX_BLOCKS_PER_REQUEST = 100
+# Notion rejects request bodies over 500 KB; leave headroom for page properties.
+MAX_BATCH_BYTES = 400 * 1024
+MAX_RICH_TEXT_ITEMS = 100
 
 
 def normalize_notion_date(raw_value: str) -> str:
@@ -51,6 +76,17 @@ def resolve_relations(
     return relations, missing
 
 
+def _relation_names(
+    relations: Sequence[Dict[str, str]]
+    ,names: Sequence[str]
+    ,missing: Sequence[str]
+) -> Dict[str, str]:
+    """Pair resolved relation ids with the names that matched them, for the export index."""
+
+    found = [name for name in names if name not in missing]
+    return {relation["id"]: name for relation, name in zip(relations, found)}
+
+
 def strip_leading_date(name: str) -> str:
     """Remove leading YYYY-MM-DD + space from names, returning original if unmatched."""
 
@@ -115,6 +151,253 @@ def _map_missing_projects(missing_lookup: Sequence[str], reverse_map: dict[str,
     return expanded
 
 
+def _body_pieces(note: ObsidianNote) -> Iterable[str]:
+    return [note.body] if note.body_loaded else iter_body_text(note.path)
+
+
+def _text_item(content: str) -> Dict:
+    return {"type": "text", "text": {"content": content}}
+
+
+def _mention_item(page_id: str) -> Dict:
+    return {"type": "mention", "mention": {"type": "page", "page": {"id": page_id}}}
+
+
+def _paragraph_block(rich_text: List[Dict]) -> Dict:
+    return {
+        "object": "block"
+        ,"type": "paragraph"
+        ,"paragraph": {
+            "rich_text": rich_text
+        }
+    }
+
+
+def _is_block(segment: Union[str, Dict]) -> bool:
+    return isinstance(segment, dict) and segment.get("object") == "block"
+
+
+def _split_body(
+    pieces: Iterable[str]
+    ,uploads: Dict[str, str]
+    ,links: Dict[str, str]
+) -> Iterator[Union[str, Dict]]:
+    """Yield body text with resolvable wiki links and embeds swapped out.
+
+    ``[[Note]]`` links found in ``links`` become page-mention rich text, and
+    ``![[file]]`` embeds found in ``uploads`` become attachment blocks. Anything
+    unresolved is passed through as literal text.
+    """
+
+    after_embed = False
+    for piece in pieces:
+        last = 0
+        if after_embed and piece.startswith("\n"):
+            # The embed's own line break is implied by the block boundary.
+            last = 1
+        after_embed = False
+        for match in BRACKETS_RE.finditer(piece, last):
+            start = match.start()
+            if start > last and piece[start - 1] == "!":
+                path = link_path(match.group(1))
+                upload_id = uploads.get(path)
+                if upload_id is None:
+                    continue
+                if start - 1 > last:
+                    yield piece[last : start - 1]
+                yield attachment_block(path, upload_id)
+                last = match.end()
+                if piece.startswith("\n", last):
+                    last += 1
+                after_embed = last == len(piece)
+                continue
+
+            page_id = links.get(link_target(match.group(1)).casefold())
+            if page_id is None:
+                continue
+            if start > last:
+                yield piece[last:start]
+            yield _mention_item(page_id)
+            last = match.end()
+        if last < len(piece):
+            yield piece[last:]
+
+
+def _pack_paragraphs(segments: Iterable[Union[str, Dict]]) -> Iterator[Dict]:
+    """Pack text and mentions into paragraphs of at most CHUNK_SIZE characters and MAX_RICH_TEXT_ITEMS items."""
+
+    items: List[Dict] = []
+    text = ""
+    length = 0
+    for segment in segments:
+        if isinstance(segment, str):
+            start = 0
+            while start < len(segment):
+                take = min(CHUNK_SIZE - length, len(segment) - start)
+                text += segment[start : start + take]
+                length += take
+                start += take
+                if length >= CHUNK_SIZE:
+                    items.append(_text_item(text))
+                    yield _paragraph_block(items)
+                    items, text, length = [], "", 0
+            continue
+
+        if text:
+            items.append(_text_item(text))
+            text = ""
+        items.append(segment)
+        # Leave room for the text run that usually follows a mention.
+        if len(items) >= MAX_RICH_TEXT_ITEMS - 1:
+            yield _paragraph_block(items)
+            items, length = [], 0
+
+    if text:
+        items.append(_text_item(text))
+    if items:
+        yield _paragraph_block(items)
+
+
+def iter_body_blocks(
+    note: ObsidianNote
+    ,uploads: Optional[Dict[str, str]] = None
+    ,links: Optional[Dict[str, str]] = None
+) -> Iterator[Dict]:
+    """Lazily generate body blocks, streaming the note from disk if its body was not loaded.
+
+    ``uploads`` maps embed targets to Notion file upload ids, and ``links`` maps
+    case-folded note names to page ids (see ``ExportIndex.link_targets``).
+    Whitespace-only paragraphs are dropped whether or not anything was resolved.
+    """
+
+    segments = _split_body(_body_pieces(note), uploads or {}, links or {})
+    for is_block, group in groupby(segments, key=_is_block):
+        if is_block:
+            yield from group
+            continue
+        for block in _pack_paragraphs(group):
+            rich_text = block["paragraph"]["rich_text"]
+            if any(item["type"] != "text" or item["text"]["content"].strip() for item in rich_text):
+                yield block
+
+
+def _upload_note_attachments(
+    note: ObsidianNote
+    ,env_config: EnvConfig
+    ,*
+    ,send_to_notion: bool
+    ,debug_logger: Optional[logging.Logger]
+) -> Tuple[Dict[str, str], List[str], Optional[AttachmentUploader]]:
+    """Locate embedded attachments and, when sending, upload them.
+
+    Returns embed target -> upload id, the targets whose files were not found,
+    and the uploader (to commit or refresh its ids) when anything was uploaded.
+    """
+
+    embeds = find_attachment_embeds(_body_pieces(note))
+    if not embeds:
+        return {}, [], None
+
+    resolver = AttachmentResolver(env_config.attachments_vault_path)
+    located: Dict[str, Path] = {}
+    missing: List[str] = []
+    for target in embeds:
+        path = resolver.resolve(target, note.path)
+        if path:
+            located[target] = path
+        else:
+            missing.append(target)
+
+    if not send_to_notion or not located:
+        return {}, missing, None
+
+    uploader = AttachmentUploader(env_config.token, UploadCache(env_config.token))
+    uploaded = uploader.upload(list(dict.fromkeys(located.values())))
+    uploads = {target: uploaded[path] for target, path in located.items() if path in uploaded}
+    if debug_logger:
+        debug_logger.info("Attachments for %s", note.path, extra={"data": dict(uploads)})
+    return uploads, missing, uploader
+
+
+def _block_upload_ids(blocks: Sequence[Dict]) -> Set[str]:
+    ids: Set[str] = set()
+    for block in blocks:
+        file_upload = block.get(block["type"], {}).get("file_upload")
+        if file_upload:
+            ids.add(file_upload["id"])
+    return ids
+
+
+def _replace_upload_ids(blocks: Sequence[Dict], replacements: Dict[str, str]) -> List[Dict]:
+    """Return copies of ``blocks`` with file upload ids swapped, leaving the originals untouched."""
+
+    replaced = copy.deepcopy(list(blocks))
+    for block in replaced:
+        file_upload = block.get(block["type"], {}).get("file_upload")
+        if file_upload and file_upload["id"] in replacements:
+            file_upload["id"] = replacements[file_upload["id"]]
+    return replaced
+
+
+def _send_blocks(
+    send: Callable[[List[Dict]], Dict]
+    ,blocks: List[Dict]
+    ,uploads: Dict[str, str]
+    ,uploader: Optional[AttachmentUploader]
+) -> Dict:
+    """Send ``blocks`` through ``send``, re-uploading dead cached attachments once if Notion rejects them.
+
+    Only a 400 whose body mentions file uploads, for a request that actually
+    carried cached ids, takes this path: those ids are dropped from the cache,
+    the files uploaded again, and the request retried with fresh ids. The
+    pending ``uploads`` map is updated for blocks not generated yet.
+    """
+
+    try:
+        return send(blocks)
+    except requests.HTTPError as err:
+        response = err.response
+        if response is None or response.status_code != 400 or uploader is None:
+            raise
+        body = response.text.lower()
+        if "file_upload" not in body and "file upload" not in body:
+            raise
+        rejected = _block_upload_ids(blocks) & uploader.cached_ids()
+        if not rejected:
+            raise
+        # Narrow to the ids Notion names in the error, when it names any.
+        rejected = {upload_id for upload_id in rejected if upload_id in response.text} or rejected
+        print("[warn] Notion rejected cached attachment uploads; re-uploading them and retrying.")
+        replacements = uploader.replace_cached(rejected)
+        for target, upload_id in uploads.items():
+            uploads[target] = replacements.get(upload_id, upload_id)
+        return send(_replace_upload_ids(blocks, replacements))
+
+
+def _batched(
+    blocks: Iterator[Dict]
+    ,size: int = MAX_BLOCKS_PER_REQUEST
+    ,max_bytes: int = MAX_BATCH_BYTES
+) -> Iterator[List[Dict]]:
+    """Group blocks into request batches bounded by count and by serialized size.
+
+    Sizes are measured as ``json.dumps`` sends them, where non-ASCII text is
+    escaped, so CJK- or emoji-heavy batches stay under Notion's request limit.
+    """
+
+    batch: List[Dict] = []
+    batch_bytes = 0
+    for block in blocks:
+        block_bytes = len(json.dumps(block)) + 1
+        if batch and (len(batch) >= size or batch_bytes + block_bytes > max_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(block)
+        batch_bytes += block_bytes
+    if batch:
+        yield batch
+
+
 def build_page_payload(
     note: ObsidianNote
     ,database: DatabaseRoute
@@ -125,8 +408,13 @@ def build_page_payload(
     
     ,*
     ,available_properties: Optional[Set[str]] = None
+    ,children: Optional[List[Dict]] = None
 ) -> Dict:
-    """Assemble the JSON body for creating a Notion page based on the parsed note."""
+    """Assemble the JSON body for creating a Notion page based on the parsed note.
+
+    Only the first request batch of body blocks is included unless ``children``
+    is supplied; the rest must be sent via append-children calls.
+    """
 
     properties: Dict[str, Dict] = {
         database.properties.name: {
@@ -161,22 +449,8 @@ def build_page_payload(
         print("[warn] Skipping participants relation: property not in database schema.")
 
 
-    CHUNK_SIZE = 1900
-
-    def chunk_text(text: str) -> List[str]:
-        return [text[i : i + CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE)] or [""]
-
-    children: List[Dict] = []
-    for chunk in chunk_text(note.body):
-        children.append(
-            {
-                "object": "block"
-                ,"type": "paragraph"
-                ,"paragraph": {
-                    "rich_text": [{"type": "text", "text": {"content": chunk}}]
-                }
-            }
-        )
+    if children is None:
+        children = next(_batched(iter_body_blocks(note)), [])
 
     return {
         "parent": {"database_id": database.resolved_db_id}
@@ -185,6 +459,25 @@ def build_page_payload(
     }
 
 
+class PartialExportError(RuntimeError):
+    """Raised when the page was created but appending later body blocks failed."""
+
+    def __init__(
+        self
+        ,page_id: str
+        ,notion_url: Optional[str]
+        ,relation_names: Dict[str, str]
+        ,appended_blocks: int
+    ) -> None:
+        super().__init__(
+            f"Created Notion page {page_id} but appending blocks failed after {appended_blocks} appended blocks"
+        )
+        self.page_id = page_id
+        self.notion_url = notion_url
+        self.relation_names = relation_names
+        self.appended_blocks = appended_blocks
+
+
 @dataclass
 class ExportResult:
     note: ObsidianNote
@@ -193,9 +486,13 @@ class ExportResult:
     missing_organizations: List[str]
     missing_projects: List[str]
     missing_participants: List[str]
+    missing_attachments: List[str] = field(default_factory=list)
 
     sent: bool = False
     notion_url: Optional[str] = None
+    page_id: Optional[str] = None
+    appended_blocks: int = 0
+    relation_names: Dict[str, str] = field(default_factory=dict)
 
 
 def export_note(
@@ -207,8 +504,13 @@ def export_note(
     ,skip_lookups: bool = False
     ,send_to_notion: bool = False
     ,debug_logger: Optional[logging.Logger] = None
+    ,link_index: Optional[Dict[str, str]] = None
 ) -> ExportResult:
-    """Parse relations, build payload, optionally call Notion, and report on missing data."""
+    """Parse relations, build payload, optionally call Notion, and report on missing data.
+
+    ``link_index`` maps case-folded note names to page ids so body wiki links
+    can be emitted as page mentions without querying Notion.
+    """
     
     if client is None and (send_to_notion or not skip_lookups):
         client = NotionClient(env_config.token)
@@ -216,6 +518,7 @@ def export_note(
         # For pure dry-runs we can work without an instantiated client.
         client = None
 
+    relation_names: Dict[str, str] = {}
     if skip_lookups or client is None:
         organizations_relations: List[Dict[str, str]] = []
         projects_relations: List[Dict[str, str]] = []
@@ -236,17 +539,24 @@ def export_note(
 
         if organizations_db:
             organizations_relations, missing_organizations = resolve_relations(client, organizations_db, note.organizations)
+            relation_names.update(_relation_names(organizations_relations, note.organizations, missing_organizations))
         else:
             organizations_relations, missing_organizations = [], note.organizations
 
         if projects_db:
             projects_relations, missing_project_lookup = resolve_relations(client, projects_db, project_lookup_names)
             missing_projects = _map_missing_projects(missing_project_lookup, project_reverse_map)
+            # Record the Obsidian link text rather than any "Notion name" override.
+            relation_names.update(
+                (page_id, project_reverse_map[lookup][0])
+                for page_id, lookup in _relation_names(projects_relations, project_lookup_names, missing_project_lookup).items()
+            )
         else:
             projects_relations, missing_projects = [], note.projects
 
         if participants_db:
             participants_relations, missing_participants = resolve_relations(client, participants_db, note.participants)
+            relation_names.update(_relation_names(participants_relations, note.participants, missing_participants))
         else:
             participants_relations, missing_participants = [], note.participants
 
@@ -258,6 +568,16 @@ def export_note(
     else:
         available_properties = None
 
+    uploads, missing_attachments, uploader = _upload_note_attachments(
+        note
+        ,env_config
+        ,send_to_notion=send_to_notion and client is not None
+        ,debug_logger=debug_logger
+    )
+
+    # Notion caps children and body size per request, so the page is created with
+    # the first batch and the remaining blocks are generated and appended lazily.
+    batches = _batched(iter_body_blocks(note, uploads, link_index))
     payload = build_page_payload(
         note
         ,database
@@ -267,15 +587,38 @@ def export_note(
         ,participants_relations
         
         ,available_properties=available_properties
+        ,children=next(batches, [])
     )
 
     response: Optional[Dict] = None
+    appended_blocks = 0
     if send_to_notion and client is not None:
         if debug_logger:
-            debug_logger.info("Sending payload for %s:\n%s", note.path, json.dumps(payload, indent=2))
-        response = client.create_page(payload)
+            debug_logger.info("Sending payload for %s", note.path, extra={"data": payload})
+        response = _send_blocks(
+            lambda children: client.create_page({**payload, "children": children})
+            ,payload["children"]
+            ,uploads
+            ,uploader
+        )
         if debug_logger:
-            debug_logger.info("Response for %s:\n%s", note.path, json.dumps(response, indent=2))
+            debug_logger.info("Response for %s", note.path, extra={"data": response})
+
+        page_id = response["id"]
+        for batch in batches:
+            if debug_logger:
+                debug_logger.info("Appending %d blocks for %s", len(batch), note.path, extra={"data": batch})
+            try:
+                _send_blocks(lambda children: client.append_block_children(page_id, children), batch, uploads, uploader)
+            except requests.HTTPError as err:
+                raise PartialExportError(page_id, response.get("url"), relation_names, appended_blocks) from err
+            appended_blocks += len(batch)
+
+        # Only now are fresh uploads attached to blocks and safe to reuse from the cache.
+        if uploader is not None:
+            uploader.commit()
+    else:
+        appended_blocks = sum(len(batch) for batch in batches)
 
     return ExportResult(
         note=note
@@ -284,7 +627,11 @@ def export_note(
         ,missing_organizations=missing_organizations
         ,missing_projects=missing_projects
         ,missing_participants=missing_participants
+        ,missing_attachments=missing_attachments
         
         ,sent=send_to_notion and response is not None
         ,notion_url=(response or {}).get("url") if response else None
+        ,page_id=(response or {}).get("id") if response else None
+        ,appended_blocks=appended_blocks
+        ,relation_names=relation_names
     )
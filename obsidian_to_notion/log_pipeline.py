@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import queue
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from pathlib import Path
+from typing import Optional
+
+
+LOG_PATH = Path(__file__).resolve().parent.parent / "export.log"
+DEBUG_LOG_PATH = Path(__file__).resolve().parent.parent / "export.debug.log"
+LOGGER_NAME = "obsidian_to_notion"
+DEBUG_LOGGER_NAME = f"{LOGGER_NAME}.debug"
+
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+# Set to a TimedRotatingFileHandler interval (e.g. "midnight") to rotate by time instead of size.
+LOG_ROTATE_WHEN: Optional[str] = None
+
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Render each record as a single JSON object per line.
+
+    Structured data attached via ``extra={"data": ...}`` is embedded as-is, so
+    payloads are only serialized here, on the writer thread.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds")
+            ,"level": record.levelname
+            ,"logger": record.name
+            ,"message": record.getMessage()
+        }
+        data = getattr(record, "data", None)
+        if data is not None:
+            entry["data"] = data
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _SnapshotQueueHandler(QueueHandler):
+    """Queue a copy of each record with its message already rendered.
+
+    The ``data`` payload is passed by reference and serialized on the writer
+    thread, so call sites log it only after its last mutation.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _ExcludeLogger(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not super().filter(record)
+
+
+def _rotating_handler(path: Path) -> logging.Handler:
+    handler: logging.Handler
+    if LOG_ROTATE_WHEN:
+        handler = TimedRotatingFileHandler(
+            path
+            ,when=LOG_ROTATE_WHEN
+            ,backupCount=LOG_BACKUP_COUNT
+            ,encoding="utf-8"
+            ,delay=True
+        )
+    else:
+        handler = RotatingFileHandler(
+            path
+            ,maxBytes=LOG_MAX_BYTES
+            ,backupCount=LOG_BACKUP_COUNT
+            ,encoding="utf-8"
+            ,delay=True
+        )
+    handler.setFormatter(JsonLinesFormatter())
+    return handler
+
+
+def _ensure_listener() -> None:
+    """Start the single background writer shared by the main and debug logs."""
+
+    global _listener
+    if _listener is not None:
+        return
+
+    main_handler = _rotating_handler(LOG_PATH)
+    main_handler.addFilter(_ExcludeLogger(DEBUG_LOGGER_NAME))
+    debug_handler = _rotating_handler(DEBUG_LOG_PATH)
+    debug_handler.addFilter(logging.Filter(DEBUG_LOGGER_NAME))
+
+    _listener = QueueListener(_queue, main_handler, debug_handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Drain queued records to disk and stop the writer thread."""
+
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
+def configure_logging() -> logging.Logger:
+    """Set up the primary info-level logger that writes JSON lines to export.log."""
+
+    logger = logging.getLogger(LOGGER_NAME)
+    if not logger.handlers:
+        _ensure_listener()
+        logger.setLevel(logging.INFO)
+        logger.addHandler(_SnapshotQueueHandler(_queue))
+    return logger
+
+
+def configure_debug_logger() -> logging.Logger:
+    """Create or return the debug logger that captures payloads/API responses."""
+
+    debug_logger = logging.getLogger(DEBUG_LOGGER_NAME)
+    if not debug_logger.handlers:
+        _ensure_listener()
+        debug_logger.setLevel(logging.INFO)
+        debug_logger.propagate = False
+        debug_logger.addHandler(_SnapshotQueueHandler(_queue))
+    return debug_logger
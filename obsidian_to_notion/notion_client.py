@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, List, Set
+import mimetypes
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
 
 try:
     import requests
@@ -42,6 +44,27 @@ class NotionClient:
         data = response.json()
         return [page["id"] for page in data.get("results", [])]
 
+    def query_database(self, database_id: str, filter: Optional[Dict] = None) -> Iterator[Dict]:
+        """Yield every page matching ``filter``, following pagination cursors."""
+
+        url = f"https://api.notion.com/v1/databases/{database_id}/query"
+        payload: Dict = {"page_size": 100}
+        if filter:
+            payload["filter"] = filter
+
+        while True:
+            response = self.session.post(url, data=json.dumps(payload))
+            try:
+                response.raise_for_status()
+            except requests.HTTPError as err:
+                print(f"[error] Notion query failed: {response.text}")
+                raise err
+            data = response.json()
+            yield from data.get("results", [])
+            if not data.get("has_more"):
+                return
+            payload["start_cursor"] = data["next_cursor"]
+
     def create_page(self, payload: Dict) -> Dict:
         """Create a page via the Notion API and return the response body."""
 
@@ -54,6 +77,47 @@ class NotionClient:
             raise err
         return response.json()
 
+    def append_block_children(self, block_id: str, children: List[Dict]) -> Dict:
+        """Append up to 100 child blocks to a page or block and return the response body."""
+
+        url = f"https://api.notion.com/v1/blocks/{block_id}/children"
+        response = self.session.patch(url, data=json.dumps({"children": children}))
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as err:
+            print(f"[error] Notion append children failed: {response.text}")
+            raise err
+        return response.json()
+
+    def upload_file(self, path: Path) -> str:
+        """Upload a file through Notion's single-part file upload flow and return its upload id."""
+
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        response = self.session.post(
+            "https://api.notion.com/v1/file_uploads"
+            ,data=json.dumps({"filename": path.name, "content_type": content_type})
+        )
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as err:
+            print(f"[error] Notion file upload create failed: {response.text}")
+            raise err
+        upload_id = response.json()["id"]
+
+        with path.open("rb") as handle:
+            # Drop the session's JSON content type so requests sets the multipart boundary.
+            response = self.session.post(
+                f"https://api.notion.com/v1/file_uploads/{upload_id}/send"
+                ,files={"file": (path.name, handle, content_type)}
+                ,headers={"Content-Type": None}
+            )
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as err:
+            print(f"[error] Notion file upload send failed: {response.text}")
+            raise err
+        return upload_id
+
     def fetch_database(self, database_id: str) -> Dict:
         """Fetch the schema for a Notion database."""
 
@@ -3,10 +3,11 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple
 
 
 BRACKETS_RE = re.compile(r"\[\[([^\]]+)\]\]")
+STREAM_READ_SIZE = 64 * 1024
 
 
 @dataclass
@@ -22,6 +23,8 @@ class ObsidianNote:
     source_name: str
     path: Path
 
+    body_loaded: bool = True
+
     @property
     def date_property(self) -> Optional[str]:
         return self.front_matter.get("date")
@@ -49,6 +52,116 @@ def parse_front_matter_and_remainder(text: str) -> Tuple[Dict[str, str], str]:
     return data, remainder
 
 
+def _needs_quotes(value: str) -> bool:
+    """Return True when a plain scalar would not read back as the same string."""
+
+    return (
+        value != value.strip()
+        or ": " in value
+        or " #" in value
+        or value.endswith(":")
+        or value.startswith("- ")
+        or value[:1] in tuple("[]{}&*!|>'\"%@`#,?")
+    )
+
+
+def _format_front_matter_value(value: str, quote: Optional[str] = None) -> str:
+    """Quote only if the original line was quoted or the value requires it."""
+
+    if quote is None and not _needs_quotes(value):
+        return value
+    quote = quote or '"'
+    if quote in value:
+        quote = "'" if quote == '"' else '"'
+    return f"{quote}{value}{quote}"
+
+
+def _existing_quote(raw_value: str) -> Optional[str]:
+    raw_value = raw_value.strip()
+    if len(raw_value) >= 2 and raw_value[0] in "\"'" and raw_value[-1] == raw_value[0]:
+        return raw_value[0]
+    return None
+
+
+def _front_matter_closing(lines: List[str]) -> Optional[int]:
+    """Index of the line closing the front matter, matching ``parse_front_matter_and_remainder``."""
+
+    if not lines or not lines[0].startswith("---"):
+        return None
+    for idx in range(1, len(lines)):
+        if lines[idx].startswith("---"):
+            return idx
+    return None
+
+
+def _is_list_item(line: str) -> bool:
+    stripped = line.strip()
+    return stripped == "-" or stripped.startswith("- ")
+
+
+def front_matter_list_keys(text: str) -> Set[str]:
+    """Return front-matter keys whose value is a YAML block list (``- item`` lines) or flow list (``[a, b]``).
+
+    ``parse_front_matter_and_remainder`` only reads scalars, so these keys
+    must not be compared or rewritten as plain strings.
+    """
+
+    lines = text.splitlines()
+    closing = _front_matter_closing(lines)
+    if closing is None:
+        return set()
+
+    keys: Set[str] = set()
+    for idx in range(1, closing):
+        line = lines[idx]
+        if ":" not in line or _is_list_item(line):
+            continue
+        raw_key, raw_value = line.split(":", 1)
+        value = raw_value.strip()
+        if (value.startswith("[") and value.endswith("]")) or (
+            not value and idx + 1 < closing and _is_list_item(lines[idx + 1])
+        ):
+            keys.add(raw_key.strip())
+    return keys
+
+
+def update_front_matter(text: str, updates: Dict[str, str]) -> str:
+    """Return ``text`` with the given front-matter keys rewritten, leaving every other line untouched.
+
+    Existing lines keep their quoting style. List-valued keys (see
+    ``front_matter_list_keys``) are never rewritten. Keys missing from the
+    front matter are appended to it; a front matter block is created if the
+    document has none.
+    """
+
+    if not updates:
+        return text
+
+    newline = "\r\n" if "\r\n" in text else "\n"
+    lines = text.splitlines(keepends=True)
+    closing = _front_matter_closing(lines)
+
+    if closing is None:
+        added = [f"{key}: {_format_front_matter_value(value)}".rstrip() + newline for key, value in updates.items()]
+        return "".join([f"---{newline}", *added, f"---{newline}", text])
+
+    list_keys = front_matter_list_keys(text)
+    remaining = {key: value for key, value in updates.items() if key not in list_keys}
+    for idx in range(1, closing):
+        line = lines[idx]
+        if ":" not in line or _is_list_item(line):
+            continue
+        raw_key, raw_value = line.split(":", 1)
+        key = raw_key.strip()
+        if key in remaining:
+            ending = line[len(line.rstrip("\r\n")) :] or newline
+            value = _format_front_matter_value(remaining.pop(key), _existing_quote(raw_value))
+            lines[idx] = f"{raw_key}: {value}".rstrip() + ending
+
+    added = [f"{key}: {_format_front_matter_value(value)}".rstrip() + newline for key, value in remaining.items()]
+    return "".join(lines[:closing] + added + lines[closing:])
+
+
 def split_metadata_and_body(text: str) -> Tuple[str, str]:
     """Separate the metadata section (above the second ---) from the body text."""
 
@@ -77,14 +190,13 @@ def extract_bracket_links(text: str) -> List[str]:
     return ordered
 
 
-def parse_note(path: Path) -> ObsidianNote:
-    """Load and parse a markdown note into structured data consumed by the exporter."""
-    
-    text = path.read_text(encoding="utf-8")
-    front_matter, remainder = parse_front_matter_and_remainder(text)
-    metadata_section, notion_body = split_metadata_and_body(remainder)
+def _label_match(text: str, label: str) -> Optional[re.Match]:
+    pattern = r"^\s*(\*\*)?\s*" + re.escape(label) + r"\s*(\*\*)?\s*:{1,2}\s*"
+    return re.match(pattern, text, flags=re.IGNORECASE)
+
 
-    lines = metadata_section.splitlines()
+def parse_metadata_links(metadata_section: str) -> Tuple[List[str], List[str], List[str]]:
+    """Return the Client, Project, and Participants wiki links from the metadata section."""
 
     organizations: List[str] = []
     projects: List[str] = []
@@ -92,25 +204,20 @@ def parse_note(path: Path) -> ObsidianNote:
 
     collecting_participants = False
 
-    def label_matches(text: str, label: str) -> bool:
-        pattern = r"^\s*(\*\*)?\s*" + re.escape(label) + r"\s*(\*\*)?\s*:{1,2}\s*"
-        return re.match(pattern, text, flags=re.IGNORECASE) is not None
-
-
-    for line in lines:
+    for line in metadata_section.splitlines():
         stripped = line.strip()
 
-        if label_matches(stripped, "Client"):
+        if _label_match(stripped, "Client"):
             organizations = extract_bracket_links(stripped)
             collecting_participants = False
             continue
 
-        if label_matches(stripped, "Project"):
+        if _label_match(stripped, "Project"):
             projects = extract_bracket_links(stripped)
             collecting_participants = False
             continue
 
-        if label_matches(stripped, "Participants"):
+        if _label_match(stripped, "Participants"):
             participants.extend(extract_bracket_links(stripped))
             collecting_participants = True
             continue
@@ -122,6 +229,158 @@ def parse_note(path: Path) -> ObsidianNote:
 
             participants.extend(extract_bracket_links(stripped))
 
+    return organizations, projects, participants
+
+
+def update_metadata_links(text: str, updates: Dict[str, List[str]]) -> str:
+    """Rewrite the wiki links on ``Client:`` / ``Project:`` / ``Participants:`` lines.
+
+    ``updates`` maps a label to its new link names. Labels without a line in
+    the metadata section are left alone. A participants list written as
+    ``- [[Name]]`` items keeps that form; inline links stay inline.
+    """
+
+    if not updates:
+        return text
+
+    newline = "\r\n" if "\r\n" in text else "\n"
+    lines = text.splitlines(keepends=True)
+    closing = _front_matter_closing(lines)
+    idx = closing + 1 if closing is not None else 0
+
+    output: List[str] = lines[:idx]
+    while idx < len(lines):
+        line = lines[idx]
+        if line.strip() == "---":
+            break
+        content = line.rstrip("\r\n")
+        ending = line[len(content) :] or newline
+
+        label = next((label for label in updates if _label_match(content, label)), None)
+        if label is None:
+            output.append(line)
+            idx += 1
+            continue
+
+        prefix = content[: _label_match(content, label).end()]
+        if prefix and not prefix[-1].isspace():
+            prefix += " "
+        names = updates[label]
+
+        # Participants may continue as "- [[Name]]" items below the label line.
+        list_end = idx + 1
+        if label == "Participants":
+            while (
+                list_end < len(lines)
+                and lines[list_end].strip().startswith("-")
+                and lines[list_end].strip() != "---"
+            ):
+                list_end += 1
+
+        if list_end > idx + 1:
+            indent = lines[idx + 1][: len(lines[idx + 1]) - len(lines[idx + 1].lstrip())]
+            output.append(prefix.rstrip() + ending)
+            output.extend(f"{indent}- [[{name}]]{ending}" for name in names)
+        else:
+            output.append((prefix + ", ".join(f"[[{name}]]" for name in names)).rstrip() + ending)
+        idx = list_end
+
+    output.extend(lines[idx:])
+    return "".join(output)
+
+
+def link_path(value: str) -> str:
+    """Strip any ``|alias`` or ``#heading`` suffix from a wiki link, leaving the linked path."""
+
+    return re.split(r"[|#]", value, maxsplit=1)[0].strip()
+
+
+def link_target(value: str) -> str:
+    """Reduce a wiki link to the note name, e.g. ``Projects/Acme.md#Notes|Acme`` -> ``Acme``."""
+
+    name = link_path(value).replace("\\", "/").rsplit("/", 1)[-1]
+    if name.lower().endswith(".md"):
+        name = name[:-3]
+    return name.strip()
+
+
+def _read_note_header(handle: TextIO) -> str:
+    """Consume the front matter and metadata section, leaving ``handle`` at the body.
+
+    Mirrors the delimiters used by ``parse_front_matter_and_remainder`` and
+    ``split_metadata_and_body`` so the returned header parses identically.
+    """
+
+    header_lines: List[str] = []
+    first_line = handle.readline()
+    header_lines.append(first_line)
+
+    if first_line.startswith("---"):
+        for line in iter(handle.readline, ""):
+            header_lines.append(line)
+            if line.startswith("---"):
+                if line[3:].strip() == "---":
+                    return "".join(header_lines)
+                break
+        else:
+            # Unclosed front matter: the whole file is metadata + body, start over.
+            handle.seek(0)
+            header_lines = []
+    elif first_line.strip() == "---":
+        return first_line
+
+    for line in iter(handle.readline, ""):
+        header_lines.append(line)
+        if line.strip() == "---":
+            break
+    return "".join(header_lines)
+
+
+def iter_body_text(path: Path) -> Iterator[str]:
+    """Yield the note body in pieces without loading the whole file.
+
+    Concatenating the pieces gives the same text as ``ObsidianNote.body``.
+    """
+
+    with path.open("r", encoding="utf-8") as handle:
+        _read_note_header(handle)
+
+        pending: Optional[str] = None
+        for piece in iter(lambda: handle.readline(STREAM_READ_SIZE), ""):
+            if pending is None:
+                if piece == "\n":
+                    continue
+                pending = piece
+                continue
+            yield pending
+            pending = piece
+
+        if pending:
+            pending = pending[:-1] if pending.endswith("\n") else pending
+            if pending:
+                yield pending
+
+
+def parse_note(path: Path, *, load_body: bool = True) -> ObsidianNote:
+    """Load and parse a markdown note into structured data consumed by the exporter.
+
+    With ``load_body=False`` only the header is read; the body is left on disk
+    for ``iter_body_text`` to stream.
+    """
+
+    if load_body:
+        text = path.read_text(encoding="utf-8")
+        front_matter, remainder = parse_front_matter_and_remainder(text)
+        metadata_section, notion_body = split_metadata_and_body(remainder)
+    else:
+        with path.open("r", encoding="utf-8") as handle:
+            header = _read_note_header(handle)
+        front_matter, remainder = parse_front_matter_and_remainder(header)
+        metadata_section, _ = split_metadata_and_body(remainder)
+        notion_body = ""
+
+    organizations, projects, participants = parse_metadata_links(metadata_section)
+
     return ObsidianNote(
         front_matter=front_matter
         ,metadata_section=metadata_section
@@ -133,4 +392,6 @@ def parse_note(path: Path) -> ObsidianNote:
         
         ,source_name=path.stem
         ,path=path
+
+        ,body_loaded=load_body
     )
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .config import PropertyMapping
+from .export_index import ExportIndex, atomic_write_text
+from .exporter import normalize_notion_date
+from .notion_client import NotionClient
+from .parser import (
+    front_matter_list_keys
+    ,parse_front_matter_and_remainder
+    ,parse_metadata_links
+    ,split_metadata_and_body
+    ,update_front_matter
+    ,update_metadata_links
+)
+
+
+def _plain_text(items: Sequence[Dict]) -> str:
+    return "".join(item.get("plain_text", "") for item in items)
+
+
+def _format_date(raw_value: str) -> str:
+    """Render a Notion date start the way notes write it: ``YYYY-MM-DD`` or ``YYYY-MM-DD HH:MM``."""
+
+    try:
+        dt = datetime.fromisoformat(normalize_notion_date(raw_value))
+    except ValueError:
+        return raw_value
+    if "T" not in raw_value:
+        return dt.date().isoformat()
+    return dt.strftime("%Y-%m-%d %H:%M")
+
+
+def _same_date(current: str, incoming: str) -> bool:
+    """Compare dates by wall-clock value so ``2024-10-04 16:00`` matches ``2024-10-04T16:00:00.000+00:00``."""
+
+    try:
+        left = datetime.fromisoformat(normalize_notion_date(current)).replace(tzinfo=None)
+        right = datetime.fromisoformat(normalize_notion_date(incoming)).replace(tzinfo=None)
+    except ValueError:
+        return current == incoming
+    return left == right
+
+
+def relation_to_names(prop: Dict, relation_names: Dict[str, str]) -> Optional[List[str]]:
+    """Return the note names for a relation property, or None if it cannot be synced.
+
+    That is the case when any page is missing from the local index (unknown
+    pages are never fetched) or when Notion truncated the list (``has_more``,
+    at most 25 ids are returned per relation in query results).
+    """
+
+    if prop.get("has_more"):
+        return None
+    names: List[str] = []
+    for relation in prop.get("relation") or []:
+        name = relation_names.get(relation["id"])
+        if name is None:
+            return None
+        names.append(name)
+    return names
+
+
+def property_to_front_matter(prop: Dict) -> Optional[str]:
+    """Convert a Notion page property into a front-matter string, or None if the type is not synced back."""
+
+    prop_type = prop.get("type")
+    value = prop.get(prop_type) if prop_type else None
+
+    if prop_type == "date":
+        return _format_date(value["start"]) if value else ""
+    if prop_type in ("select", "status"):
+        return value["name"] if value else ""
+    if prop_type == "multi_select":
+        return ", ".join(option["name"] for option in value or [])
+    if prop_type == "rich_text":
+        return _plain_text(value or [])
+    if prop_type == "checkbox":
+        return "true" if value else "false"
+    if prop_type == "number":
+        return "" if value is None else str(value)
+    if prop_type in ("url", "email", "phone_number"):
+        return value or ""
+    return None
+
+
+@dataclass
+class PullResult:
+    updated: Dict[Path, List[str]] = field(default_factory=dict)
+    missing_notes: List[Path] = field(default_factory=list)
+    pages_seen: int = 0
+
+
+def pull_updates(
+    client: NotionClient
+    ,index: ExportIndex
+    ,database_ids: Sequence[str]
+    ,*
+    ,properties: Optional[PropertyMapping] = None
+    ,debug_logger: Optional[logging.Logger] = None
+) -> PullResult:
+    """Sync properties edited in Notion back into exported notes.
+
+    Each database is read with one paginated query filtered on
+    ``last_edited_time`` since its stored watermark; pages are matched to notes
+    through the export index and only keys whose values changed are rewritten.
+    """
+
+    properties = properties or PropertyMapping()
+    result = PullResult()
+
+    for database_id in database_ids:
+        watermark = index.watermarks.get(database_id)
+        query_filter = (
+            {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": watermark}}
+            if watermark
+            else None
+        )
+
+        latest = watermark
+        for page in client.query_database(database_id, filter=query_filter):
+            result.pages_seen += 1
+            edited = page.get("last_edited_time")
+            if edited and (latest is None or edited > latest):
+                latest = edited
+
+            entry = index.pages.get(page["id"])
+            if not entry:
+                continue
+            note_path = Path(entry["path"])
+            if not note_path.exists():
+                result.missing_notes.append(note_path)
+                continue
+
+            changed = _pull_page(page, note_path, index, properties)
+            if changed:
+                result.updated[note_path] = changed
+                if debug_logger:
+                    debug_logger.info("Pulled %s into %s", page["id"], note_path, extra={"data": changed})
+
+        if latest:
+            index.watermarks[database_id] = latest
+
+    return result
+
+
+def _relation_labels(properties: PropertyMapping) -> Dict[str, str]:
+    """Map relation property names to the metadata-section labels ``parse_note`` reads them from."""
+
+    labels = {
+        properties.organizations: "Client"
+        ,properties.projects: "Project"
+        ,properties.participants: "Participants"
+    }
+    return {prop_name: label for prop_name, label in labels.items() if prop_name}
+
+
+def _pull_page(page: Dict, note_path: Path, index: ExportIndex, properties: PropertyMapping) -> List[str]:
+    """Rewrite changed front-matter keys and relation link lines for one page; return what changed.
+
+    Only keys already present in the front matter (matched case-insensitively,
+    plus the mapped ``date``) are touched, and list-valued keys are skipped.
+    Relations are written to the ``Client:`` / ``Project:`` / ``Participants:``
+    lines the exporter reads them from.
+    """
+
+    with note_path.open("r", encoding="utf-8", newline="") as handle:
+        text = handle.read()
+    normalized = text.replace("\r\n", "\n")
+    front_matter, remainder = parse_front_matter_and_remainder(normalized)
+    metadata_section, _ = split_metadata_and_body(remainder)
+    current_links = dict(zip(("Client", "Project", "Participants"), parse_metadata_links(metadata_section)))
+    relation_labels = _relation_labels(properties)
+    list_keys = front_matter_list_keys(normalized)
+    keys_by_name = {key.casefold(): key for key in front_matter}
+
+    updates: Dict[str, str] = {}
+    link_updates: Dict[str, List[str]] = {}
+    for prop_name, prop in page.get("properties", {}).items():
+        if prop_name == properties.name or prop.get("type") == "title":
+            continue
+
+        if prop.get("type") == "relation":
+            label = relation_labels.get(prop_name)
+            names = relation_to_names(prop, index.relations) if label else None
+            if names is not None and set(names) != set(current_links[label]):
+                link_updates[label] = names
+            continue
+
+        incoming = property_to_front_matter(prop)
+        if incoming is None:
+            continue
+
+        lookup = "date" if prop_name == properties.date else prop_name
+        key = keys_by_name.get(lookup.casefold())
+        if key is None:
+            if lookup == "date" and incoming:
+                updates["date"] = incoming
+            continue
+        if key in list_keys:
+            continue
+        current = front_matter[key]
+        if prop.get("type") == "date" and current and incoming and _same_date(current, incoming):
+            continue
+        if current != incoming:
+            updates[key] = incoming
+
+    if updates or link_updates:
+        text = update_metadata_links(update_front_matter(text, updates), link_updates)
+        atomic_write_text(note_path, text, newline="")
+    return list(updates) + list(link_updates)
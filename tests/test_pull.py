@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from obsidian_to_notion.config import PropertyMapping
+from obsidian_to_notion.export_index import ExportIndex
+from obsidian_to_notion.parser import front_matter_list_keys, update_front_matter
+from obsidian_to_notion.pull import _pull_page, relation_to_names
+
+
+NOTE = """---
+date: 2024-10-04 16:00
+Status: draft
+tags:
+  - meeting
+  - weekly
+aliases: [standup, sync]
+---
+Client: [[Acme]]
+
+---
+
+Body
+"""
+
+
+def _page(**properties):
+    return {"id": "page-1", "properties": properties}
+
+
+def _multi_select(*names):
+    return {"type": "multi_select", "multi_select": [{"name": name} for name in names]}
+
+
+def _write_note(tmp_path: Path) -> Path:
+    note_path = tmp_path / "note.md"
+    note_path.write_text(NOTE, encoding="utf-8", newline="")
+    return note_path
+
+
+def test_front_matter_list_keys_detects_block_and_flow_lists():
+    assert front_matter_list_keys(NOTE) == {"tags", "aliases"}
+
+
+def test_update_front_matter_leaves_list_keys_untouched():
+    assert update_front_matter(NOTE, {"tags": "meeting", "aliases": "standup"}) == NOTE
+
+
+def test_pull_skips_list_properties(tmp_path):
+    note_path = _write_note(tmp_path)
+    page = _page(
+        Tags=_multi_select("meeting", "weekly", "remote")
+        ,Aliases=_multi_select("standup")
+    )
+
+    changed = _pull_page(page, note_path, ExportIndex(path=tmp_path / "index.json"), PropertyMapping())
+
+    assert changed == []
+    assert note_path.read_text(encoding="utf-8") == NOTE
+
+
+def test_pull_matches_keys_case_insensitively(tmp_path):
+    note_path = _write_note(tmp_path)
+    page = _page(status={"type": "select", "select": {"name": "done"}})
+
+    changed = _pull_page(page, note_path, ExportIndex(path=tmp_path / "index.json"), PropertyMapping())
+
+    assert changed == ["Status"]
+    assert note_path.read_text(encoding="utf-8") == NOTE.replace("Status: draft", "Status: done")
+
+
+def test_truncated_relation_is_not_synced():
+    prop = {"type": "relation", "relation": [{"id": "org-1"}], "has_more": True}
+
+    assert relation_to_names(prop, {"org-1": "Acme"}) is None